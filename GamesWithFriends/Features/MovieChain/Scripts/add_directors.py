@@ -12,12 +12,170 @@ Usage:
 """
 
 import sqlite3
-import csv
 import gzip
+import io
+import itertools
+import mmap
+import multiprocessing
 import os
+import shutil
+import signal
+import subprocess
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import polars as pl
+except ImportError:  # Optional: fall back to the pure-Python TSV scans
+    pl = None
+
+
+# Read buffer for the multi-GB TSV streams; fewer read syscalls than the 8KB default
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Slice of a memory-mapped TSV searched at once by the principals workers
+MMAP_WINDOW_SIZE = 16 * 1024 * 1024
+
+
+@contextmanager
+def open_tsv(path):
+    """
+    Open a TSV file for reading text, decompressing .tsv.gz on the fly.
+    Uses pigz when installed so inflate runs on other cores than the parser.
+    """
+    # IMDb rows end in '\n' only, so skip universal-newline translation
+    if not path.endswith('.gz'):
+        with open(path, 'r', buffering=READ_BUFFER_SIZE, encoding='utf-8', newline='\n') as f:
+            yield f
+        return
+    
+    pigz = shutil.which('pigz')
+    if pigz is None:
+        with gzip.open(path, 'rb') as raw:
+            buffered = io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+            yield io.TextIOWrapper(buffered, encoding='utf-8', newline='\n')
+        return
+    
+    proc = subprocess.Popen([pigz, '-dc', path], stdout=subprocess.PIPE, bufsize=READ_BUFFER_SIZE)
+    try:
+        yield io.TextIOWrapper(proc.stdout, encoding='utf-8', newline='\n')
+        # Anything left unread means the caller stopped early (e.g. the
+        # name.basics early exit), which kills pigz with SIGPIPE on close
+        stopped_early = bool(proc.stdout.read(1))
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    
+    # A truncated or corrupt .gz must not pass for a short but valid file
+    if proc.returncode != 0 and not (stopped_early and proc.returncode == -signal.SIGPIPE):
+        raise RuntimeError(f"pigz failed to decompress {path} (exit status {proc.returncode})")
+
+
+def split_byte_ranges(path, start, count):
+    """Split a file from offset start into roughly count (start, end) byte ranges."""
+    size = os.path.getsize(path)
+    step = max(1, -(-(size - start) // count))
+    return [(offset, min(offset + step, size)) for offset in range(start, size, step)]
+
+
+def line_start_at(mm, offset):
+    """Return the offset of the first line starting at or after offset in mm."""
+    if offset <= 0:
+        return 0
+    newline = mm.find(b'\n', offset - 1)
+    return len(mm) if newline == -1 else newline + 1
+
+
+def find_director_lines(window):
+    """Return the decoded lines of a bytes window that contain b'director'."""
+    lines = []
+    pos = window.find(b'director')
+    while pos != -1:
+        line_start = window.rfind(b'\n', 0, pos) + 1
+        line_end = window.find(b'\n', pos)
+        if line_end == -1:
+            line_end = len(window)
+        lines.append(window[line_start:line_end].decode('utf-8'))
+        pos = window.find(b'director', line_end)
+    return lines
+
+
+def principals_columns(header):
+    """Resolve (tconst, nconst, category) column positions from the header line."""
+    header = header.rstrip('\n').split('\t')
+    return header.index('tconst'), header.index('nconst'), header.index('category')
+
+
+def scan_principals_lines(lines, columns):
+    """
+    Scan a list of title.principals.tsv lines for director rows.
+    Returns (rows processed, list of (tconst, nconst) links).
+    """
+    i_tconst, i_nconst, i_category = columns
+    movie_directors = []
+    append = movie_directors.append
+    maxsplit = max(columns) + 1
+    
+    # Tight loop: no counters or progress checks, callers report per chunk.
+    # IMDb TSVs have no quoting or embedded tabs, so a plain split is exact
+    for line in lines:
+        # Substring search runs in C and rejects most rows without splitting them
+        if 'director' not in line:
+            continue
+        
+        row = line.rstrip('\n').split('\t', maxsplit)
+        
+        # Only process director rows
+        if row[i_category] != 'director':
+            continue
+        
+        tconst = row[i_tconst]
+        nconst = row[i_nconst]
+        
+        # Skip if missing data; filtering to our movies happens in SQLite
+        if not tconst or not nconst:
+            continue
+        
+        append((tconst, nconst))
+    
+    return len(lines), movie_directors
+
+
+def parse_principals_chunk(task):
+    """
+    Pool worker: scan one byte range of an uncompressed title.principals.tsv.
+    Lines belong to the range they start in. The range is searched in
+    memory-mapped windows for b'director', so only candidate lines are ever
+    decoded and split in Python; rows are counted with bytes.count.
+    """
+    path, start, end, columns = task
+    rows_processed = 0
+    movie_directors = []
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = line_start_at(mm, start)
+        end = line_start_at(mm, end)
+        
+        window_start = start
+        while window_start < end:
+            window_end = line_start_at(mm, min(window_start + MMAP_WINDOW_SIZE, end))
+            window = mm[window_start:window_end]
+            rows_processed += window.count(b'\n')
+            movie_directors.extend(scan_principals_lines(find_director_lines(window), columns)[1])
+            window_start = window_end
+        
+        # Count a final line that has no trailing newline
+        if start < end == len(mm) and mm[end - 1] != ord('\n'):
+            rows_processed += 1
+    
+    return rows_processed, movie_directors
+
+
+# Host-parameter limit per statement, which bounds rows per multi-row INSERT.
+# Fallback for Python 3.10, whose Connection has no getlimit()
+MAX_SQL_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
 
 class DirectorDatabaseBuilder:
     """Builds director tables in the MovieChain SQLite database."""
@@ -29,12 +187,25 @@ class DirectorDatabaseBuilder:
         self.conn = None
         
     def connect(self):
-        """Connect to the database."""
+        """
+        Load the database into memory. Every build phase runs in RAM and
+        vacuum_database() writes the result back to db_path with VACUUM INTO.
+        """
         print(f"Opening database: {self.db_path}")
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.execute("PRAGMA journal_mode = WAL")
-        self.conn.execute("PRAGMA synchronous = NORMAL")
-        self.conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+        # Autocommit mode: bulk-load phases issue BEGIN/COMMIT explicitly
+        self.conn = sqlite3.connect(':memory:', isolation_level=None)
+        
+        print("Copying database into memory...")
+        source = sqlite3.connect(self.db_path)
+        try:
+            source.backup(self.conn)
+        finally:
+            source.close()
+        
+        # Nothing durable until VACUUM INTO, so skip fsyncs entirely
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        self.conn.execute("PRAGMA cache_size = -262144")  # 256MB cache
         
     def disconnect(self):
         """Close the database connection."""
@@ -56,10 +227,13 @@ class DirectorDatabaseBuilder:
         print("Creating new director tables...")
         cursor = self.conn.cursor()
         
+        # Keys are added as unique indexes in create_indexes() once the data is
+        # loaded; a sorted bulk build is much faster than per-row B-tree upkeep.
+        
         # Create directors table
         cursor.execute("""
             CREATE TABLE directors (
-                nconst TEXT PRIMARY KEY,
+                nconst TEXT NOT NULL,
                 name TEXT NOT NULL
             )
         """)
@@ -68,65 +242,82 @@ class DirectorDatabaseBuilder:
         cursor.execute("""
             CREATE TABLE movie_directors (
                 tconst TEXT NOT NULL,
-                nconst TEXT NOT NULL,
-                PRIMARY KEY (tconst, nconst)
+                nconst TEXT NOT NULL
             )
         """)
         
         self.conn.commit()
         print("Tables created.")
         
-    def get_existing_movie_ids(self):
-        """Get set of all movie IDs currently in the database."""
-        print("Loading existing movie IDs from database...")
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT tconst FROM movies")
-        movie_ids = {row[0] for row in cursor.fetchall()}
-        print(f"Found {len(movie_ids):,} movies in database.")
-        return movie_ids
-        
-    def extract_director_relationships(self, existing_movies):
+    def extract_director_relationships(self):
         """
-        Extract director-movie relationships from title.principals.tsv.
-        Returns dict mapping nconst -> set of tconst values.
+        Load director rows from title.principals.tsv into the principals_raw
+        temp table. Joining against movies is left to SQLite.
         """
         print(f"Processing {self.title_principals_path}...")
         
-        # Map director nconst -> set of movie tconsts
-        director_movies = {}
-        rows_processed = 0
-        directors_found = 0
+        cursor = self.conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS temp.principals_raw")
+        cursor.execute("CREATE TEMP TABLE principals_raw (tconst TEXT NOT NULL, nconst TEXT NOT NULL)")
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Compressed input stays on the stdlib path, which checks pigz/gzip for truncation
+        if pl is not None and not self.title_principals_path.endswith('.gz'):
+            links_found = self.extract_director_relationships_polars()
+            self.conn.commit()
+            print(f"Loaded {links_found:,} director rows.")
+            return
         
-        with open(self.title_principals_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
+        rows_processed = 0
+        links_found = 0
+        
+        def load(chunk_rows, chunk_links):
+            nonlocal rows_processed, links_found
+            self.insert_rows('principals_raw', ('tconst', 'nconst'), chunk_links)
+            rows_processed += chunk_rows
+            links_found += len(chunk_links)
+            print(f"  Processed {rows_processed:,} rows, found {links_found:,} director rows...")
+        
+        if self.title_principals_path.endswith('.gz'):
+            # A gzip stream can't be split by byte offset, so parse it as it inflates
+            with open_tsv(self.title_principals_path) as f:
+                columns = principals_columns(f.readline())
+                while True:
+                    lines = list(itertools.islice(f, 1_000_000))
+                    if not lines:
+                        break
+                    load(*scan_principals_lines(lines, columns))
+        else:
+            # Split the body into byte ranges; workers re-align each range to line starts
+            with open(self.title_principals_path, 'rb') as f:
+                header = f.readline()
+            body_start = len(header)
+            columns = principals_columns(header.decode('utf-8'))
+            workers = os.cpu_count() or 1
+            ranges = split_byte_ranges(self.title_principals_path, body_start, workers * 4)
+            tasks = [(self.title_principals_path, start, end, columns) for start, end in ranges]
             
-            for row in reader:
-                rows_processed += 1
-                
-                # Progress indicator every million rows
-                if rows_processed % 1_000_000 == 0:
-                    print(f"  Processed {rows_processed:,} rows, found {directors_found:,} director links...")
-                
-                # Only process director rows
-                if row.get('category') != 'director':
-                    continue
-                    
-                tconst = row.get('tconst')
-                nconst = row.get('nconst')
-                
-                # Skip if missing data or movie not in our database
-                if not tconst or not nconst or tconst not in existing_movies:
-                    continue
-                
-                # Add relationship
-                if nconst not in director_movies:
-                    director_movies[nconst] = set()
-                director_movies[nconst].add(tconst)
-                directors_found += 1
+            with multiprocessing.Pool(workers) as pool:
+                for result in pool.imap_unordered(parse_principals_chunk, tasks):
+                    load(*result)
         
+        self.conn.commit()
         print(f"Completed processing {rows_processed:,} rows.")
-        print(f"Found {len(director_movies):,} unique directors for {directors_found:,} movie-director links.")
-        return director_movies
+        print(f"Loaded {links_found:,} director rows.")
+        
+    def get_director_ids(self):
+        """Get set of director IDs credited on movies in the database."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT p.nconst
+            FROM principals_raw p
+            JOIN movies m ON m.tconst = p.tconst
+        """)
+        # Stream rows off the cursor rather than materializing a list of tuples first
+        director_ids = {row[0] for row in cursor}
+        print(f"Found {len(director_ids):,} unique directors of movies in database.")
+        return director_ids
         
     def extract_director_names(self, director_nconsts):
         """
@@ -135,96 +326,181 @@ class DirectorDatabaseBuilder:
         """
         print(f"Processing {self.name_basics_path}...")
         
+        if pl is not None and not self.name_basics_path.endswith('.gz'):
+            return self.extract_director_names_polars(director_nconsts)
+        
         director_names = {}
         rows_processed = 0
         names_found = 0
         
         # Convert to set for fast lookup
         needed_nconsts = set(director_nconsts)
-        
-        with open(self.name_basics_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
+        remaining = len(needed_nconsts)
+        
+        # name.basics.tsv is sorted by numeric ID, so no row past the largest
+        # needed ID can match (compare numerically: nm9999999 < nm10000000)
+        last_needed = max((int(nconst[2:]) for nconst in needed_nconsts), default=0)
+        
+        with open_tsv(self.name_basics_path) as f:
+            # Resolve column positions once instead of building a dict per row
+            header = f.readline().rstrip('\n').split('\t')
+            i_nconst = header.index('nconst')
+            i_name = header.index('primaryName')
+            maxsplit = max(i_nconst, i_name) + 1
             
-            for row in reader:
-                rows_processed += 1
-                
-                # Progress indicator every million rows
-                if rows_processed % 1_000_000 == 0:
-                    print(f"  Processed {rows_processed:,} rows, found {names_found:,} director names...")
+            # Read a million lines at a time so the inner loop carries no
+            # counters or progress checks; progress is reported per chunk
+            while remaining:
+                lines = list(itertools.islice(f, 1_000_000))
+                if not lines:
+                    break
                 
-                nconst = row.get('nconst')
+                # IMDb TSVs have no quoting or embedded tabs, so a plain split is exact
+                for line_number, line in enumerate(lines, 1):
+                    row = line.rstrip('\n').split('\t', maxsplit)
+                    nconst = row[i_nconst]
+                    
+                    # Check if this is a director we need
+                    if nconst not in needed_nconsts:
+                        continue
+                    
+                    name = row[i_name]
+                    if name and name != '\\N':
+                        director_names[nconst] = name
+                        names_found += 1
+                    
+                    # Early exit once every needed ID has been seen, named or not
+                    remaining -= 1
+                    if not remaining:
+                        break
                 
-                # Check if this is a director we need
-                if nconst not in needed_nconsts:
-                    continue
+                rows_processed += line_number
+                print(f"  Processed {rows_processed:,} rows, found {names_found:,} director names...")
                 
-                name = row.get('primaryName')
-                if name and name != '\\N':
-                    director_names[nconst] = name
-                    names_found += 1
-                    
-                # Early exit if we've found all directors
-                if names_found == len(needed_nconsts):
-                    print(f"  Found all {names_found:,} director names, stopping scan.")
+                if not remaining:
+                    print(f"  Matched all {len(needed_nconsts):,} needed director IDs, stopping scan.")
+                    break
+                if int(nconst[2:]) > last_needed:
+                    print("  Passed the last needed director ID, stopping scan.")
                     break
         
         print(f"Completed processing {rows_processed:,} rows.")
         print(f"Found {len(director_names):,} director names out of {len(needed_nconsts):,} needed.")
         return director_names
         
+    def extract_director_relationships_polars(self):
+        """
+        Vectorized version of extract_director_relationships using Polars.
+        Filters title.principals.tsv in native code and returns the row count loaded.
+        """
+        principals = pl.scan_csv(
+            self.title_principals_path,
+            separator='\t',
+            has_header=True,
+            quote_char=None,
+            infer_schema_length=0,  # Read every column as a string
+        )
+        
+        rels = (
+            principals
+            .filter((pl.col('category') == 'director') & pl.col('nconst').is_not_null())
+            .select(['tconst', 'nconst'])
+            .collect(engine='streaming')
+        )
+        
+        return self.insert_rows('principals_raw', ('tconst', 'nconst'), rels.iter_rows())
+        
+    def extract_director_names_polars(self, director_nconsts):
+        """
+        Vectorized version of extract_director_names using Polars.
+        Semi-joins name.basics.tsv against the needed director IDs.
+        """
+        needed_nconsts = set(director_nconsts)
+        names = pl.scan_csv(
+            self.name_basics_path,
+            separator='\t',
+            has_header=True,
+            quote_char=None,
+            infer_schema_length=0,  # Read every column as a string
+        )
+        needed = pl.LazyFrame({'nconst': list(needed_nconsts)}, schema={'nconst': pl.Utf8})
+        
+        rows = (
+            names
+            .select(['nconst', 'primaryName'])
+            .join(needed, on='nconst', how='semi')
+            .filter(pl.col('primaryName').is_not_null() & (pl.col('primaryName') != '\\N'))
+            .collect(engine='streaming')
+        )
+        
+        director_names = dict(rows.iter_rows())
+        print(f"Found {len(director_names):,} director names out of {len(needed_nconsts):,} needed.")
+        return director_names
+        
+    def insert_rows(self, table, columns, rows):
+        """
+        Insert rows using multi-row INSERT ... VALUES (?, ?), (?, ?), ... statements.
+        Every full batch reuses the same SQL text, so it is parsed and prepared once.
+        Returns the number of rows inserted.
+        """
+        cursor = self.conn.cursor()
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        placeholders = '(' + ', '.join('?' * len(columns)) + ')'
+        if hasattr(self.conn, 'getlimit'):
+            max_variables = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        else:
+            max_variables = MAX_SQL_VARIABLES
+        batch_size = max_variables // len(columns)
+        batch_sql = prefix + ', '.join([placeholders] * batch_size)
+        
+        rows = iter(rows)
+        inserted = 0
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            if len(batch) == batch_size:
+                sql = batch_sql
+            else:
+                sql = prefix + ', '.join([placeholders] * len(batch))
+            cursor.execute(sql, list(itertools.chain.from_iterable(batch)))
+            inserted += len(batch)
+        
+        return inserted
+        
     def insert_directors(self, director_names):
         """Insert directors into the directors table."""
         print(f"Inserting {len(director_names):,} directors...")
         
         cursor = self.conn.cursor()
-        batch_size = 50_000
-        batch = []
-        inserted = 0
-        
-        for nconst, name in director_names.items():
-            batch.append((nconst, name))
-            
-            if len(batch) >= batch_size:
-                cursor.executemany("INSERT INTO directors (nconst, name) VALUES (?, ?)", batch)
-                self.conn.commit()
-                inserted += len(batch)
-                print(f"  Inserted {inserted:,} directors...")
-                batch = []
-        
-        # Insert remaining
-        if batch:
-            cursor.executemany("INSERT INTO directors (nconst, name) VALUES (?, ?)", batch)
-            self.conn.commit()
-            inserted += len(batch)
         
+        # One transaction for the whole phase
+        cursor.execute("BEGIN IMMEDIATE")
+        inserted = self.insert_rows('directors', ('nconst', 'name'), director_names.items())
+        self.conn.commit()
         print(f"Inserted {inserted:,} directors total.")
         
-    def insert_movie_directors(self, director_movies):
-        """Insert movie-director relationships into movie_directors table."""
+    def insert_movie_directors(self):
+        """
+        Insert movie-director relationships into movie_directors table,
+        joining principals_raw against movies and named directors in SQLite.
+        Duplicate (tconst, nconst) pairs are dropped here rather than in Python.
+        """
         print("Inserting movie-director relationships...")
         
         cursor = self.conn.cursor()
-        batch_size = 50_000
-        batch = []
-        inserted = 0
-        
-        for nconst, tconsts in director_movies.items():
-            for tconst in tconsts:
-                batch.append((tconst, nconst))
-                
-                if len(batch) >= batch_size:
-                    cursor.executemany("INSERT INTO movie_directors (tconst, nconst) VALUES (?, ?)", batch)
-                    self.conn.commit()
-                    inserted += len(batch)
-                    print(f"  Inserted {inserted:,} relationships...")
-                    batch = []
-        
-        # Insert remaining
-        if batch:
-            cursor.executemany("INSERT INTO movie_directors (tconst, nconst) VALUES (?, ?)", batch)
-            self.conn.commit()
-            inserted += len(batch)
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("""
+            INSERT INTO movie_directors (tconst, nconst)
+            SELECT DISTINCT p.tconst, p.nconst
+            FROM principals_raw p
+            JOIN movies m ON m.tconst = p.tconst
+            JOIN directors d ON d.nconst = p.nconst
+        """)
+        inserted = cursor.rowcount
+        self.conn.commit()
         
+        cursor.execute("DROP TABLE principals_raw")
         print(f"Inserted {inserted:,} movie-director relationships total.")
         
     def create_fts_index(self):
@@ -242,23 +518,25 @@ class DirectorDatabaseBuilder:
             )
         """)
         
-        # Populate FTS index
-        cursor.execute("""
-            INSERT INTO directors_fts (rowid, name)
-            SELECT rowid, name FROM directors
-        """)
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Populate FTS index from the external content table in one bulk pass
+        cursor.execute("INSERT INTO directors_fts (directors_fts) VALUES ('rebuild')")
         
         self.conn.commit()
         print("FTS5 index created.")
         
     def create_indexes(self):
-        """Create indexes on movie_directors for fast lookups."""
-        print("Creating indexes on movie_directors...")
+        """Create unique keys and lookup indexes on the director tables."""
+        print("Creating indexes on directors and movie_directors...")
         
         cursor = self.conn.cursor()
         
-        # Index for finding directors by movie
-        cursor.execute("CREATE INDEX idx_movie_directors_tconst ON movie_directors(tconst)")
+        # Unique key for director lookups by ID
+        cursor.execute("CREATE UNIQUE INDEX idx_directors_nconst ON directors(nconst)")
+        
+        # Unique key on (tconst, nconst); also serves finding directors by movie
+        cursor.execute("CREATE UNIQUE INDEX idx_movie_directors_tconst ON movie_directors(tconst, nconst)")
         
         # Index for finding movies by director
         cursor.execute("CREATE INDEX idx_movie_directors_nconst ON movie_directors(nconst)")
@@ -266,10 +544,32 @@ class DirectorDatabaseBuilder:
         self.conn.commit()
         print("Indexes created.")
         
+    def analyze_database(self):
+        """Gather query planner statistics for the new director tables."""
+        print("Analyzing director tables...")
+        self.conn.execute("ANALYZE directors")
+        self.conn.execute("ANALYZE movie_directors")
+        self.conn.execute("PRAGMA optimize")
+        print("Analyze complete.")
+        
     def vacuum_database(self):
-        """Optimize the database."""
+        """
+        Write the in-memory database back to disk. VACUUM INTO writes a compacted
+        copy in one pass, which then replaces the original database file.
+        """
         print("Vacuuming database (this may take a while)...")
-        self.conn.execute("VACUUM")
+        compact_path = self.db_path + '.vacuum'
+        if os.path.exists(compact_path):
+            os.remove(compact_path)
+        
+        # VACUUM INTO syncs its output according to the main database's setting
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("VACUUM INTO ?", (compact_path,))
+        
+        # Swap in the compacted copy and reopen it for the summary
+        self.disconnect()
+        os.replace(compact_path, self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
         print("Vacuum complete.")
         
     def print_stats(self):
@@ -300,6 +600,21 @@ class DirectorDatabaseBuilder:
         gz_path = self.db_path + '.gz'
         print(f"Compressing database to {gz_path}...")
         
+        pigz = shutil.which('pigz')
+        if pigz is not None:
+            # Parallel deflate across all cores; -k keeps the .sqlite, -f overwrites an old .gz
+            subprocess.run([pigz, '-9', '-f', '-k', self.db_path], check=True)
+        else:
+            self.gzip_database(gz_path)
+        
+        if os.path.exists(gz_path):
+            gz_size_mb = os.path.getsize(gz_path) / (1024 * 1024)
+            db_size_mb = os.path.getsize(self.db_path) / (1024 * 1024)
+            compression_ratio = (1 - gz_size_mb / db_size_mb) * 100
+            print(f"Compression complete: {db_size_mb:.1f} MB -> {gz_size_mb:.1f} MB ({compression_ratio:.1f}% reduction)")
+        
+    def gzip_database(self, gz_path):
+        """Single-threaded fallback for compress_database when pigz is not installed."""
         with open(self.db_path, 'rb') as f_in:
             with gzip.open(gz_path, 'wb', compresslevel=9) as f_out:
                 # Copy in chunks
@@ -317,12 +632,6 @@ class DirectorDatabaseBuilder:
                     if bytes_written % (50 * 1024 * 1024) == 0:
                         print(f"  Compressed {bytes_written / (1024*1024):.0f} MB...")
         
-        if os.path.exists(gz_path):
-            gz_size_mb = os.path.getsize(gz_path) / (1024 * 1024)
-            db_size_mb = os.path.getsize(self.db_path) / (1024 * 1024)
-            compression_ratio = (1 - gz_size_mb / db_size_mb) * 100
-            print(f"Compression complete: {db_size_mb:.1f} MB -> {gz_size_mb:.1f} MB ({compression_ratio:.1f}% reduction)")
-        
     def build(self):
         """Main build process."""
         try:
@@ -334,34 +643,30 @@ class DirectorDatabaseBuilder:
             # Step 2: Create new tables
             self.create_tables()
             
-            # Step 3: Get existing movies
-            existing_movies = self.get_existing_movie_ids()
+            # Step 3: Load director rows into a temp table
+            self.extract_director_relationships()
             
-            # Step 4: Extract director-movie relationships
-            director_movies = self.extract_director_relationships(existing_movies)
+            # Step 4: Find directors of movies in the database
+            director_nconsts = self.get_director_ids()
             
             # Step 5: Extract director names
-            director_names = self.extract_director_names(director_movies.keys())
+            director_names = self.extract_director_names(director_nconsts)
             
-            # Step 6: Filter to only directors with names
-            director_movies = {
-                nconst: movies 
-                for nconst, movies in director_movies.items() 
-                if nconst in director_names
-            }
-            
-            # Step 7: Insert directors
+            # Step 6: Insert directors
             self.insert_directors(director_names)
             
-            # Step 8: Insert relationships
-            self.insert_movie_directors(director_movies)
+            # Step 7: Insert relationships for movies in the database and directors with names
+            self.insert_movie_directors()
             
-            # Step 9: Create FTS index
+            # Step 8: Create FTS index
             self.create_fts_index()
             
-            # Step 10: Create indexes
+            # Step 9: Create indexes
             self.create_indexes()
             
+            # Step 10: Gather planner statistics (stored in the database file)
+            self.analyze_database()
+            
             # Step 11: Vacuum database
             self.vacuum_database()
             
@@ -386,6 +691,15 @@ class DirectorDatabaseBuilder:
                 self.disconnect()
 
 
+def find_tsv(directory, name):
+    """Return the path to name in directory, falling back to name.gz if only that exists."""
+    path = directory / name
+    gz_path = directory / (name + ".gz")
+    if not path.exists() and gz_path.exists():
+        return gz_path
+    return path
+
+
 def main():
     """Main entry point."""
     # Determine paths
@@ -395,9 +709,10 @@ def main():
     # Path to decompressed database (in app documents, but we'll use a local copy for building)
     db_path = project_root / "moviechain_core.sqlite"
     
-    # Paths to TSV files (assumed to be in project root)
-    title_principals_path = project_root / "title.principals.tsv"
-    name_basics_path = project_root / "name.basics.tsv"
+    # Paths to TSV files (assumed to be in project root). Decompressed files are
+    # preferred since they can be scanned in parallel; otherwise read the .gz directly.
+    title_principals_path = find_tsv(project_root, "title.principals.tsv")
+    name_basics_path = find_tsv(project_root, "name.basics.tsv")
     
     # Check if files exist
     if not db_path.exists():